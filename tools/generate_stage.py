@@ -14,75 +14,400 @@ Example:
 
 import librosa
 import numpy as np
+import soundfile as sf
 import json
 import argparse
+import functools
+import glob
+import hashlib
+import io
+import multiprocessing as mp
 import os
+import subprocess
+import zipfile
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit when numba is not installed."""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+# Pillar difficulty by normalized amplitude: below EASY_AMPLITUDE is easy,
+# below MEDIUM_AMPLITUDE medium, anything louder hard. Lanes blocked and
+# pillar widths are indexed by difficulty (easy, medium, hard)
+EASY_AMPLITUDE = 0.3
+MEDIUM_AMPLITUDE = 0.6
+DIFFICULTY_LANES = (2, 3, 4)
+DIFFICULTY_WIDTHS = (50, 70, 90)
+
+# Pillars on beats brighter than this block the top lanes
+TOP_BRIGHTNESS = 0.5
+
+
+def _keep_mask(xs, min_spacing):
+    """
+    Greedily keep sorted positions at least min_spacing apart.
+    
+    Pure-Python fallback for _score()'s spacing pass when numba is not
+    installed.
+    """
+    out = np.zeros(xs.size, np.bool_)
+    last = -min_spacing
+    for i in range(xs.size):
+        if xs[i] - last >= min_spacing:
+            out[i] = True
+            last = xs[i]
+    return out
+
+
+@njit(cache=True)
+def _score(xs, amps, brights, min_spacing):
+    """
+    Score pillar candidates in a single compiled pass.
+    
+    Applies the spacing rule of _keep_mask() and the difficulty and
+    placement rules of StageGenerator._get_pillar_difficulty() and
+    generate_pillars() to every candidate.
+    
+    Returns:
+        tuple: (keep_mask, widths, nlanes, is_top) arrays
+    """
+    n = xs.size
+    keep = np.zeros(n, np.bool_)
+    widths = np.empty(n, np.int64)
+    nlanes = np.empty(n, np.int64)
+    is_top = np.empty(n, np.bool_)
+    last = -min_spacing
+    for i in range(n):
+        if xs[i] - last >= min_spacing:
+            keep[i] = True
+            last = xs[i]
+        if amps[i] < EASY_AMPLITUDE:
+            level = 0
+        elif amps[i] < MEDIUM_AMPLITUDE:
+            level = 1
+        else:
+            level = 2
+        nlanes[i] = DIFFICULTY_LANES[level]
+        widths[i] = DIFFICULTY_WIDTHS[level]
+        is_top[i] = brights[i] > TOP_BRIGHTNESS
+    return keep, widths, nlanes, is_top
+
+
+@functools.lru_cache(maxsize=8)
+def _fft_frequencies(sr, n_fft):
+    """STFT bin center frequencies, cached per (sr, n_fft) across songs."""
+    # float32 so the centroid einsum does not promote the spectrogram
+    return librosa.fft_frequencies(sr=sr, n_fft=n_fft).astype(np.float32)
+
+
+def _normalize(values):
+    """
+    Min/max-normalize an array to [0, 1].
+    
+    Empty arrays are returned as-is and constant ones (e.g. silence) map
+    to all zeros instead of dividing by zero.
+    """
+    if values.size == 0:
+        return values
+    lo, hi = values.min(), values.max()
+    if hi <= lo:
+        return np.zeros_like(values)
+    return (values - lo) / (hi - lo)
+
+
+class _SeparatorTable(dict):
+    """
+    str.translate() table mapping every non-alphanumeric, non-space
+    character to a space.
+    
+    Latin-1 is filled in up front; any other code point is classified on
+    first sight and cached, so lookups stay in C after the first hit.
+    """
+    
+    def __missing__(self, code):
+        c = chr(code)
+        self[code] = code if c.isalnum() or c.isspace() else ord(' ')
+        return self[code]
+
 
 class StageGenerator:
-    def __init__(self, scroll_speed=80, min_pillar_spacing=400):
+    # Analysis sample rate. Lower rates cut the spectral centroid off below
+    # the song's high end (5.5 kHz at 11025 Hz, 8 kHz at 16000 Hz), which
+    # moves pillars between top and bottom lanes, so this stays at 22050 Hz
+    SAMPLE_RATE = 22050
+    
+    # Resampler for the librosa.load fallback: soxr is a C library with no
+    # numba JIT warm-up (unlike resampy). The high-quality mode is
+    # librosa's default; the quick mode shifts beats and brightness
+    RES_TYPE = 'soxr_hq'
+    
+    # STFT parameters shared by every feature extracted in analyze_audio():
+    # librosa's defaults at SAMPLE_RATE, a 93 ms window at ~43 frames/s.
+    # A 1024 hop (~21.5 frames/s) shifts beat_track's tempo estimates and
+    # moves pillars between lanes, so the hop stays at 512
+    N_FFT = 2048
+    HOP_LENGTH = 512
+    RMS_FRAME_LENGTH = 2048  # 93 ms, librosa's default
+    
+    # Translation table used by _to_camelcase() to split on punctuation
+    _TRANS = _SeparatorTable(str.maketrans({
+        c: ' ' for c in map(chr, range(256)) if not (c.isalnum() or c.isspace())
+    }))
+    
+    # Hex digits of the cache key embedded in cache file names
+    _CACHE_DIGEST_LENGTH = 12
+    
+    # Bump when analyze_audio() output changes so stale caches are missed
+    ANALYSIS_VERSION = 6
+    
+    # Scalar analysis fields and their Python types, restored from the
+    # 0-d arrays np.load returns for cached analyses
+    _SCALAR_FIELDS = {
+        'duration': float,
+        'tempo': float,
+        'onset_count': int,
+        'sample_rate': int,
+    }
+    
+    def __init__(self, scroll_speed=80, min_pillar_spacing=400, use_cache=True):
         """
         Initialize stage generator.
         
         Args:
             scroll_speed: Pixels per second for game scrolling (default: 80)
             min_pillar_spacing: Minimum distance between pillars in pixels (default: 400)
+            use_cache: Reuse/store audio analysis next to the audio file (default: True)
         """
         self.scroll_speed = scroll_speed
         self.min_pillar_spacing = min_pillar_spacing
+        self.use_cache = use_cache
+        
+    def _load_audio(self, audio_path):
+        """
+        Decode audio to mono float32 at SAMPLE_RATE.
+        
+        Decodes with ffmpeg, which is much faster than librosa's audioread
+        path for MP3. Resamples with ffmpeg's soxr at the precision of
+        soxr's HQ mode and averages the channels like librosa.to_mono, so
+        the samples match librosa.load. Falls back to librosa.load if
+        ffmpeg is missing, lacks soxr or cannot decode the file.
+        
+        Returns:
+            tuple: (samples, sample_rate)
+        """
+        sr = self.SAMPLE_RATE
+        try:
+            raw = subprocess.check_output([
+                'ffmpeg', '-nostdin', '-v', 'quiet', '-i', audio_path,
+                '-af', f'aresample={sr}:resampler=soxr:precision=20',
+                '-c:a', 'pcm_f32le', '-f', 'wav', '-'
+            ])
+        except (OSError, subprocess.CalledProcessError):
+            raw = b''
+        
+        if raw:
+            # WAV rather than raw PCM so the channel count comes with it
+            try:
+                data, _ = sf.read(io.BytesIO(raw), dtype='float32', always_2d=True)
+            except (RuntimeError, ValueError):
+                data = None
+            if data is not None:
+                return data.mean(axis=1), sr
+        
+        return librosa.load(audio_path, sr=sr, mono=True,
+                            res_type=self.RES_TYPE, dtype=np.float32)
+    
+    def _cache_path(self, audio_path):
+        """
+        Path of the analysis cache for an audio file.
         
+        The file name embeds a hash of the audio path, its modification time
+        and the analysis parameters, so changing any of them misses the cache.
+        """
+        key = '|'.join(str(part) for part in (
+            os.path.abspath(audio_path), os.path.getmtime(audio_path),
+            self.SAMPLE_RATE, self.N_FFT, self.HOP_LENGTH,
+            self.RMS_FRAME_LENGTH, self.ANALYSIS_VERSION
+        ))
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()[:self._CACHE_DIGEST_LENGTH]
+        return f"{audio_path}.{digest}.analysis.npz"
+    
+    def _load_cached_analysis(self, cache_path, audio_path):
+        """
+        Load a cached analysis, or None if it is missing, stale or unreadable.
+        """
+        if not (os.path.exists(cache_path) and
+                os.path.getmtime(cache_path) > os.path.getmtime(audio_path)):
+            return None
+        
+        try:
+            with np.load(cache_path) as data:
+                analysis = {key: data[key] for key in data.files}
+            for key, cast in self._SCALAR_FIELDS.items():
+                analysis[key] = cast(analysis[key])
+        except (OSError, EOFError, ValueError, KeyError, zipfile.BadZipFile):
+            return None
+        
+        return analysis
+    
+    def _save_cached_analysis(self, cache_path, audio_path, analysis):
+        """
+        Store an analysis next to its audio file; failures are not fatal.
+        
+        Writes to a temporary file and renames it into place, so a killed
+        worker never leaves a partial cache behind, then removes caches
+        left over from older versions of the same audio file.
+        """
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                np.savez_compressed(f, **analysis)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            print(f"Warning: could not write analysis cache {cache_path}: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return
+        
+        # Only this file's own caches: "<audio>.<digest>.analysis.npz". A bare
+        # "*" would also match caches of files like "<audio>.wav"
+        digest_pattern = '[0-9a-f]' * self._CACHE_DIGEST_LENGTH
+        own_caches = f"{glob.escape(audio_path)}.{digest_pattern}.analysis.npz"
+        for stale_path in glob.glob(own_caches):
+            if stale_path != cache_path:
+                try:
+                    os.remove(stale_path)
+                except OSError:
+                    pass
+    
     def analyze_audio(self, audio_path):
         """
         Analyze audio file using librosa.
         
+        Results are cached next to the audio file (see _cache_path()), so
+        regenerating a stage with different pillar settings skips librosa.
+        
         Returns:
             dict: Audio analysis data including beats, onsets, tempo, etc.
         """
+        cache_path = self._cache_path(audio_path) if self.use_cache else None
+        if cache_path:
+            analysis = self._load_cached_analysis(cache_path, audio_path)
+            if analysis is not None:
+                print(f"Using cached analysis: {cache_path}")
+                return analysis
+        
         print(f"Loading audio file: {audio_path}")
-        y, sr = librosa.load(audio_path)
-        duration = float(librosa.get_duration(y=y, sr=sr))
+        y, sr = self._load_audio(audio_path)
+        y = y.astype(np.float32, copy=False)
+        duration = len(y) / sr
         
         print(f"Duration: {duration:.2f}s, Sample rate: {sr}Hz")
         
-        # Detect tempo and beats
-        print("Detecting tempo and beats...")
-        tempo, beat_frames = librosa.beat.beat_track(y=y, sr=sr)
-        tempo = float(tempo)  # Convert to Python float
-        beat_times = librosa.frames_to_time(beat_frames, sr=sr)
-        
-        # Detect onsets (note attacks, drum hits, etc.)
-        print("Detecting onsets...")
-        onset_frames = librosa.onset.onset_detect(y=y, sr=sr, backtrack=True)
-        onset_times = librosa.frames_to_time(onset_frames, sr=sr)
-        onset_strength = librosa.onset.onset_strength(y=y, sr=sr)
-        
-        # Calculate RMS amplitude envelope
+        # Compute a single STFT shared by every feature below instead of
+        # letting each librosa call recompute its own spectrogram
+        hop_length = self.HOP_LENGTH
+        # Features stay single precision throughout: float32 is plenty for
+        # min/max-normalized features and halves the bytes moved per pass
+        S = np.abs(librosa.stft(y, n_fft=self.N_FFT, hop_length=hop_length))
+        S = S.astype(np.float32, copy=False)
+        
+        # Calculate RMS amplitude envelope from the waveform, with the same
+        # 93 ms frame librosa uses by default at 22050 Hz. RMS of the
+        # Hann-windowed STFT frames weights each frame differently and
+        # shifts the difficulty distribution
         print("Calculating amplitude envelope...")
-        rms = librosa.feature.rms(y=y)[0]
-        rms_times = librosa.times_like(rms, sr=sr)
+        rms = librosa.feature.rms(
+            y=y, frame_length=self.RMS_FRAME_LENGTH, hop_length=hop_length
+        )[0].astype(np.float32, copy=False)
+        rms_times = librosa.times_like(rms, sr=sr, hop_length=hop_length)
+        
+        # The waveform is not needed past this point; free it so batch
+        # workers do not each hold a full song in memory
+        del y
+        
+        # Onset envelopes from the shared mel spectrogram. onset_strength
+        # needs the STFT framing to center them on the spectrogram frames.
+        # beat_track(y=...) aggregates across mel bands with the median,
+        # while onset detection uses the default mean, so keep one of each
+        mel_db = librosa.power_to_db(
+            librosa.feature.melspectrogram(S=S**2, sr=sr), ref=np.max
+        )
+        beat_env = librosa.onset.onset_strength(
+            S=mel_db, sr=sr, n_fft=self.N_FFT, hop_length=hop_length,
+            aggregate=np.median
+        )
+        onset_env = librosa.onset.onset_strength(
+            S=mel_db, sr=sr, n_fft=self.N_FFT, hop_length=hop_length
+        )
+        del mel_db
         
-        # Calculate spectral centroid (brightness/frequency content)
+        # Detect tempo and beats
+        print("Detecting tempo and beats...")
+        tempo, beat_frames = librosa.beat.beat_track(
+            onset_envelope=beat_env, sr=sr, hop_length=hop_length
+        )
+        tempo = float(np.atleast_1d(tempo)[0])  # Convert to Python float
+        beat_times = librosa.frames_to_time(beat_frames, sr=sr, hop_length=hop_length)
+        
+        # Count onsets (note attacks, drum hits, etc.) as prominent local
+        # peaks of the onset envelope. Only the count is used, so this
+        # skips onset_detect's numba-compiled peak picking and backtracking
+        print("Counting onsets...")
+        threshold = onset_env.mean() + onset_env.std()
+        mid = onset_env[1:-1]
+        onset_count = int(np.count_nonzero(
+            (mid > onset_env[:-2]) & (mid >= onset_env[2:]) & (mid > threshold)
+        ))
+        
+        # Calculate spectral centroid (brightness/frequency content) from the
+        # shared spectrogram; it is normalized over the whole song but only
+        # kept at the beat frames since that is all generate_pillars() reads
         print("Calculating spectral features...")
-        spectral_centroid = librosa.feature.spectral_centroid(y=y, sr=sr)[0]
+        spectral_centroid = np.einsum(
+            'k,kn->n', _fft_frequencies(sr, self.N_FFT), S
+        ) / (S.sum(axis=0) + 1e-9)
+        
+        # Only the small per-frame/per-beat feature vectors are kept
+        del S
         
         # Normalize features
-        rms_normalized = (rms - rms.min()) / (rms.max() - rms.min())
-        spectral_normalized = (spectral_centroid - spectral_centroid.min()) / \
-                             (spectral_centroid.max() - spectral_centroid.min())
+        rms_normalized = _normalize(rms)
+        spectral_normalized = _normalize(spectral_centroid)[beat_frames]
         
-        print(f"Analysis complete: {len(beat_times)} beats, {len(onset_times)} onsets, tempo: {tempo:.1f} BPM")
+        print(f"Analysis complete: {len(beat_times)} beats, {onset_count} onsets, tempo: {tempo:.1f} BPM")
         
-        return {
+        analysis = {
             'duration': duration,
             'tempo': tempo,
             'beat_times': beat_times,
-            'onset_times': onset_times,
+            'onset_count': onset_count,
             'rms': rms_normalized,
             'rms_times': rms_times,
-            'spectral_centroid': spectral_normalized,
+            'spectral_centroid': spectral_normalized,  # one value per beat
             'sample_rate': sr
         }
+        
+        if cache_path:
+            self._save_cached_analysis(cache_path, audio_path, analysis)
+        
+        return analysis
     
     def generate_pillars(self, analysis):
         """
@@ -92,11 +417,9 @@ class StageGenerator:
             analysis: Dictionary from analyze_audio()
             
         Returns:
-            list: Pillar configurations
+            dict: Pillar columns as parallel arrays: 'x', 'width',
+                'nlanes' (lanes blocked) and 'is_top' (block top lanes)
         """
-        pillars = []
-        last_pillar_x = -self.min_pillar_spacing
-        
         # Use beats as primary pillar positions (skip some for variety)
         print("Generating pillars from beats...")
         beat_times = analysis['beat_times']
@@ -104,59 +427,58 @@ class StageGenerator:
         rms_times = analysis['rms_times']
         spectral = analysis['spectral_centroid']
         
-        # Place pillars on beats (skip every other beat for playability)
-        for i, beat_time in enumerate(beat_times):
-            if i % 2 != 0:  # Use every other beat
-                continue
-                
-            x_pos = int(float(beat_time) * self.scroll_speed)
-            
-            # Check minimum spacing
-            if x_pos - last_pillar_x < self.min_pillar_spacing:
-                continue
-            
-            # Get amplitude at this beat
-            rms_idx = np.argmin(np.abs(rms_times - beat_time))
-            amplitude = rms[rms_idx]
-            
-            # Get spectral centroid at this beat
-            spectral_idx = min(rms_idx, len(spectral) - 1)
-            brightness = spectral[spectral_idx]
-            
-            # Determine pillar properties based on amplitude
-            blocked_lanes, width = self._get_pillar_difficulty(amplitude)
-            
-            # Determine top/bottom placement based on spectral brightness
-            is_top = brightness > 0.5
-            blocked_lanes = self._adjust_lane_position(blocked_lanes, is_top)
-            
-            pillars.append({
-                'x': x_pos,
-                'blockedLanes': blocked_lanes,
-                'width': width
-            })
+        # Look up the amplitude at every beat in one pass: rms_times is
+        # sorted, so a binary search plus a neighbour check finds the
+        # nearest RMS frame without scanning the whole array per beat
+        rms_idx = np.clip(np.searchsorted(rms_times, beat_times), 1, len(rms) - 1)
+        prev_closer = (beat_times - rms_times[rms_idx - 1]) < (rms_times[rms_idx] - beat_times)
+        rms_idx = rms_idx - prev_closer
+        amps = rms[rms_idx]
+        brights = spectral
+        
+        # Candidate positions: every other beat, for playability
+        xs = (beat_times[::2] * self.scroll_speed).astype(np.int32)
+        amps = amps[::2]
+        brights = brights[::2]
+        
+        if HAS_NUMBA:
+            keep, widths, nlanes, is_top = _score(
+                xs, amps, brights, self.min_pillar_spacing
+            )
+            xs, widths, nlanes, is_top = xs[keep], widths[keep], nlanes[keep], is_top[keep]
+        else:
+            # Enforce minimum spacing between consecutive pillars
+            keep = _keep_mask(xs, self.min_pillar_spacing)
+            xs, amps, brights = xs[keep], amps[keep], brights[keep]
             
-            last_pillar_x = x_pos
+            # Pillar difficulty from amplitude, top/bottom placement from
+            # spectral brightness
+            nlanes, widths = self._get_pillar_difficulty(amps)
+            is_top = brights > TOP_BRIGHTNESS
+        
+        # Keep pillars column-wise; rows are only materialized on export
+        pillars = {'x': xs, 'width': widths, 'nlanes': nlanes, 'is_top': is_top}
         
-        print(f"Generated {len(pillars)} pillars")
+        print(f"Generated {len(xs)} pillars")
         return pillars
     
-    def _get_pillar_difficulty(self, amplitude):
+    def _get_pillar_difficulty(self, amps):
         """
         Determine pillar difficulty based on amplitude.
         
+        Louder beats block more lanes with wider pillars; see
+        EASY_AMPLITUDE and DIFFICULTY_LANES/DIFFICULTY_WIDTHS.
+        
+        Args:
+            amps: Array of normalized amplitudes, one per pillar
+            
         Returns:
-            tuple: (number_of_lanes_blocked, pillar_width)
+            tuple: (number_of_lanes_blocked, pillar_width) arrays
         """
-        if amplitude < 0.3:
-            # Easy: block 2 lanes
-            return 2, 50
-        elif amplitude < 0.6:
-            # Medium: block 3 lanes
-            return 3, 70
-        else:
-            # Hard: block 4 lanes
-            return 4, 90
+        level = (amps >= EASY_AMPLITUDE).astype(np.intp) + (amps >= MEDIUM_AMPLITUDE)
+        nlanes = np.asarray(DIFFICULTY_LANES)[level]
+        widths = np.asarray(DIFFICULTY_WIDTHS)[level]
+        return nlanes, widths
     
     def _adjust_lane_position(self, num_lanes, is_top):
         """
@@ -176,6 +498,22 @@ class StageGenerator:
             # Block bottom lanes (lower force needed)
             return list(range(num_lanes))
     
+    def _pillar_rows(self, pillars):
+        """
+        Iterate pillar columns as (x, blocked_lanes, width) rows.
+        
+        Args:
+            pillars: Pillar columns from generate_pillars()
+            
+        Yields:
+            tuple: (x, blocked_lanes, width) with native Python types
+        """
+        for x, width, num_lanes, is_top in zip(
+            pillars['x'].tolist(), pillars['width'].tolist(),
+            pillars['nlanes'].tolist(), pillars['is_top'].tolist()
+        ):
+            yield x, self._adjust_lane_position(num_lanes, is_top), width
+    
     def generate_stage_config(self, audio_path, stage_name=None):
         """
         Generate complete stage configuration from audio file.
@@ -201,21 +539,21 @@ class StageGenerator:
         # Calculate stage length
         stage_length = int(analysis['duration'] * self.scroll_speed)
         
-        # Build stage config (ensure all values are Python native types)
+        # Build stage config
         config = {
             'name': stage_name,
             'audioFile': filename,
-            'duration': float(round(analysis['duration'], 2)),
-            'bpm': float(round(analysis['tempo'], 1)),
-            'length': int(stage_length),
+            'duration': round(analysis['duration'], 2),
+            'bpm': round(analysis['tempo'], 1),
+            'length': stage_length,
             'forceMultiplier': 1.0,
             'pillars': pillars,
             'metadata': {
                 'generatedFrom': 'librosa',
-                'tempo': float(round(analysis['tempo'], 1)),
-                'beats': int(len(analysis['beat_times'])),
-                'onsets': int(len(analysis['onset_times'])),
-                'pillarsGenerated': int(len(pillars))
+                'tempo': round(analysis['tempo'], 1),
+                'beats': len(analysis['beat_times']),
+                'onsets': analysis['onset_count'],
+                'pillarsGenerated': len(pillars['x'])
             }
         }
         
@@ -237,14 +575,27 @@ class StageGenerator:
             safe_name = self._to_camelcase(config['name'])
             output_file = f"../src/game/generated/{safe_name}.json"
             
-            # Create directory if it doesn't exist
+            # Create directory if it doesn't exist (batch workers may race)
             output_dir = os.path.dirname(output_file)
-            if output_dir and not os.path.exists(output_dir):
-                os.makedirs(output_dir)
-        
-        # Write clean JSON file
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(config, f, indent=2, ensure_ascii=False)
+            if output_dir:
+                os.makedirs(output_dir, exist_ok=True)
+        
+        # The JSON format lists one object per pillar
+        config = {**config, 'pillars': [
+            {'x': x, 'blockedLanes': blocked_lanes, 'width': width}
+            for x, blocked_lanes, width in self._pillar_rows(config['pillars'])
+        ]}
+        
+        # Write clean JSON file (orjson when available: much faster, and
+        # serializes NumPy scalars/arrays natively)
+        if orjson is not None:
+            with open(output_file, 'wb') as f:
+                f.write(orjson.dumps(
+                    config, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY
+                ))
+        else:
+            with open(output_file, 'w', encoding='utf-8') as f:
+                json.dump(config, f, indent=2, ensure_ascii=False)
         
         print(f"✓ JSON file created: {output_file}")
         return output_file
@@ -265,13 +616,13 @@ class StageGenerator:
             safe_name = self._to_camelcase(config['name'])
             output_file = f"../src/game/generated/{safe_name}.js"
             
-            # Create directory if it doesn't exist
+            # Create directory if it doesn't exist (batch workers may race)
             output_dir = os.path.dirname(output_file)
-            if output_dir and not os.path.exists(output_dir):
-                os.makedirs(output_dir)
+            if output_dir:
+                os.makedirs(output_dir, exist_ok=True)
         
         # Format as JavaScript module with inline data
-        js_code = f"""// Auto-generated stage configuration
+        header = f"""// Auto-generated stage configuration
 // Generated from: {config['audioFile']}
 // Tempo: {config['bpm']} BPM, Duration: {config['duration']}s
 
@@ -285,12 +636,7 @@ export default {{
   "pillars": [
 """
         
-        # Add pillars (compact format)
-        for pillar in config['pillars']:
-            lanes_str = json.dumps(pillar['blockedLanes'])
-            js_code += f"    {{ \"x\": {pillar['x']}, \"blockedLanes\": {lanes_str}, \"width\": {pillar['width']} }},\n"
-        
-        js_code += f"""  ],
+        footer = f"""  ],
   "metadata": {{
     "generatedFrom": "{config['metadata']['generatedFrom']}",
     "tempo": {config['metadata']['tempo']},
@@ -301,9 +647,15 @@ export default {{
 }};
 """
         
-        # Write JavaScript file
+        # Stream the JavaScript file, pillars in compact format. blockedLanes
+        # only holds ints, so repr() already yields valid JSON.
         with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(js_code)
+            f.write(header)
+            f.writelines(
+                f"    {{ \"x\": {x}, \"blockedLanes\": {blocked_lanes!r}, \"width\": {width} }},\n"
+                for x, blocked_lanes, width in self._pillar_rows(config['pillars'])
+            )
+            f.write(footer)
         
         print(f"✓ JS module created: {output_file}")
         return output_file
@@ -311,7 +663,7 @@ export default {{
     def _to_camelcase(self, text):
         """Convert text to camelCase for JavaScript variable name."""
         # Remove special characters and split
-        words = ''.join(c if c.isalnum() or c.isspace() else ' ' for c in text).split()
+        words = text.translate(self._TRANS).split()
         if not words:
             return 'stage'
         
@@ -330,14 +682,117 @@ export default {{
         return filtered_words[0].lower() + ''.join(w.capitalize() for w in filtered_words[1:])
 
 
+# Audio formats picked up by --batch
+AUDIO_EXTENSIONS = ('.mp3', '.wav', '.ogg', '.flac')
+
+
+def _worker(job):
+    """
+    Generate and export one stage in a batch worker process.
+    
+    Module-level so it can be pickled by multiprocessing. Errors are
+    returned instead of raised, so one bad file does not abort the pool.
+    
+    Args:
+        job: (audio_path, scroll_speed, min_pillar_spacing, use_cache) tuple
+        
+    Returns:
+        tuple: (audio_path, stage config, JS path, error message); config
+            and JS path are None on failure, error is None on success
+    """
+    audio_path, scroll_speed, min_pillar_spacing, use_cache = job
+    try:
+        generator = StageGenerator(
+            scroll_speed=scroll_speed,
+            min_pillar_spacing=min_pillar_spacing,
+            use_cache=use_cache
+        )
+        config = generator.generate_stage_config(audio_path)
+        generator.export_to_json(config)
+        js_path = generator.export_to_js(config)
+    except Exception as e:
+        message = f"{type(e).__name__}: {e}" if str(e) else type(e).__name__
+        return audio_path, None, None, message
+    return audio_path, config, js_path, None
+
+
+def run_batch(directory, scroll_speed, min_pillar_spacing, use_cache=True):
+    """
+    Generate stages for every audio file in a directory in parallel.
+    
+    Args:
+        directory: Folder containing audio files
+        scroll_speed: Pixels per second for game scrolling
+        min_pillar_spacing: Minimum distance between pillars in pixels
+        use_cache: Reuse/store audio analysis next to each audio file
+        
+    Returns:
+        int: Exit code (1 if any file failed)
+    """
+    audio_files = sorted(
+        path for path in glob.glob(os.path.join(directory, '*'))
+        if path.lower().endswith(AUDIO_EXTENSIONS)
+    )
+    if not audio_files:
+        print(f"Error: No audio files found in: {directory}")
+        return 1
+    
+    # Stages are written to paths derived from their names, so files whose
+    # names map to the same stage would overwrite each other mid-write
+    namer = StageGenerator()
+    by_stage = {}
+    for path in audio_files:
+        stem = os.path.splitext(os.path.basename(path))[0]
+        by_stage.setdefault(namer._to_camelcase(stem), []).append(path)
+    duplicates = {name: paths for name, paths in by_stage.items() if len(paths) > 1}
+    if duplicates:
+        print("Error: These files would generate the same stage; rename or remove them:")
+        for name, paths in sorted(duplicates.items()):
+            print(f"  {name}: {', '.join(paths)}")
+        return 1
+    
+    print(f"\nGenerating {len(audio_files)} stages from: {directory}")
+    print(f"Scroll speed: {scroll_speed}px/s")
+    print(f"Min pillar spacing: {min_pillar_spacing}px\n")
+    
+    jobs = [
+        (path, scroll_speed, min_pillar_spacing, use_cache)
+        for path in audio_files
+    ]
+    
+    # Jobs are long-running, so hand them out one at a time
+    failures = []
+    with mp.Pool() as pool:
+        for audio_path, config, js_path, error in pool.imap_unordered(_worker, jobs, chunksize=1):
+            if error:
+                failures.append((audio_path, error))
+                print(f"✗ {audio_path}: {error}")
+            else:
+                print(f"✓ {config['name']}: {config['metadata']['pillarsGenerated']} pillars -> {js_path}")
+    
+    print(f"\n{'='*80}")
+    print(f"{len(audio_files) - len(failures)} OF {len(audio_files)} STAGES GENERATED")
+    for audio_path, error in sorted(failures):
+        print(f"FAILED: {audio_path}: {error}")
+    print(f"{'='*80}\n")
+    return 1 if failures else 0
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Generate stage configuration from audio file using librosa'
     )
     parser.add_argument(
         'audio_file',
+        nargs='?',
         help='Path to audio file (MP3, WAV, etc.)'
     )
+    parser.add_argument(
+        '--batch', '-b',
+        metavar='DIR',
+        help='Generate stages for every audio file in DIR in parallel',
+        default=None
+    )
     parser.add_argument(
         '--output', '-o',
         help='Output file for JavaScript configuration (default: auto-generated in src/game/generated/)',
@@ -360,9 +815,26 @@ def main():
         help='Minimum pillar spacing in pixels (default: 400)',
         default=400
     )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Re-analyze audio instead of reusing cached analysis'
+    )
     
     args = parser.parse_args()
     
+    if args.batch:
+        if args.audio_file or args.name or args.output:
+            parser.error('--batch cannot be combined with an audio file, --name or --output')
+        if not os.path.isdir(args.batch):
+            print(f"Error: Directory not found: {args.batch}")
+            return 1
+        return run_batch(args.batch, args.scroll_speed, args.spacing,
+                         use_cache=not args.no_cache)
+    
+    if not args.audio_file:
+        parser.error('an audio file or --batch DIR is required')
+    
     # Check if audio file exists
     if not os.path.exists(args.audio_file):
         print(f"Error: Audio file not found: {args.audio_file}")
@@ -371,7 +843,8 @@ def main():
     # Generate stage
     generator = StageGenerator(
         scroll_speed=args.scroll_speed,
-        min_pillar_spacing=args.spacing
+        min_pillar_spacing=args.spacing,
+        use_cache=not args.no_cache
     )
     
     print(f"\nGenerating stage from: {args.audio_file}")
@@ -393,7 +866,7 @@ def main():
     print(f"Stage: {config['name']}")
     print(f"Duration: {config['duration']}s")
     print(f"Tempo: {config['bpm']} BPM")
-    print(f"Pillars: {len(config['pillars'])}")
+    print(f"Pillars: {config['metadata']['pillarsGenerated']}")
     print(f"JSON: {json_path}")
     print(f"JS Module: {js_path}")
     print(f"{'='*80}\n")